@@ -6,16 +6,28 @@ Version corrigée - Résolution des bugs identifiés
 
 import asyncio
 import datetime
-import json
+import functools
 import logging
 import os
+import random
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote as _urlquote
+import fastjsonschema
 import httpx
+import orjson
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# Configuration du logging (niveau réglable via LOG_LEVEL, INFO si la valeur est inconnue)
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+_log_level = logging.getLevelName(LOG_LEVEL)
+logging.basicConfig(level=_log_level if isinstance(_log_level, int) else logging.INFO)
 logger = logging.getLogger("dolibarr-mcp")
+if not isinstance(_log_level, int):
+    logger.warning("LOG_LEVEL invalide (%s), niveau INFO utilisé", LOG_LEVEL)
 
 # Configuration via variables d'environnement - CORRIGÉE
 DOLIBARR_BASE_URL = os.getenv("DOLIBARR_BASE_URL", "")
@@ -23,6 +35,10 @@ DOLIBARR_API_KEY = os.getenv("DOLIBARR_API_KEY", "")
 DEFAULT_LIMIT = int(os.getenv("DEFAULT_LIMIT", "100"))
 DEFAULT_SORT_ORDER = os.getenv("DEFAULT_SORT_ORDER", "DESC")
 DEFAULT_AGENDA_LIMIT = int(os.getenv("DEFAULT_AGENDA_LIMIT", "100"))
+DOLIBARR_POOL_MAX = int(os.getenv("DOLIBARR_POOL_MAX", "100"))
+DOLIBARR_POOL_KEEPALIVE = int(os.getenv("DOLIBARR_POOL_KEEPALIVE", "20"))
+DOLIBARR_POOL_WARMUP = int(os.getenv("DOLIBARR_POOL_WARMUP", "1"))
+DOLIBARR_MAX_CONCURRENCY = int(os.getenv("DOLIBARR_MAX_CONCURRENCY", str(DOLIBARR_POOL_KEEPALIVE)))
 
 # Vérification de la configuration
 if not DOLIBARR_API_KEY:
@@ -33,11 +49,216 @@ if not DOLIBARR_BASE_URL:
     logger.error("ERREUR: DOLIBARR_BASE_URL non définie.")
     sys.exit(1)
 
-logger.info(f"Configuration chargée - URL: {DOLIBARR_BASE_URL}")
-logger.info(f"Clé API: {'*' * (len(DOLIBARR_API_KEY) - 4) + DOLIBARR_API_KEY[-4:] if len(DOLIBARR_API_KEY) > 4 else '***'}")
-logger.info(f"Limite par défaut: {DEFAULT_LIMIT}")
-logger.info(f"Ordre par défaut: {DEFAULT_SORT_ORDER}")
-logger.info(f"Limite agenda: {DEFAULT_AGENDA_LIMIT}")
+logger.info("Configuration chargée - URL: %s", DOLIBARR_BASE_URL)
+logger.info("Clé API: %s", '*' * (len(DOLIBARR_API_KEY) - 4) + DOLIBARR_API_KEY[-4:] if len(DOLIBARR_API_KEY) > 4 else '***')
+logger.info("Limite par défaut: %s", DEFAULT_LIMIT)
+logger.info("Ordre par défaut: %s", DEFAULT_SORT_ORDER)
+logger.info("Limite agenda: %s", DEFAULT_AGENDA_LIMIT)
+logger.info("Pool de connexions: %s max, %s keep-alive", DOLIBARR_POOL_MAX, DOLIBARR_POOL_KEEPALIVE)
+logger.info("Requêtes simultanées: %s max (réduites automatiquement sur 429/503)", DOLIBARR_MAX_CONCURRENCY)
+
+# Cache des lectures GET (durée de vie en secondes, nombre maximum d'entrées)
+CACHE_TTL = 30
+CACHE_MAX_ENTRIES = 256
+# Après un échec de Dolibarr, la réponse périmée est resservie directement pendant ce délai
+CACHE_STALE_RETRY = 5.0
+
+# Durée de vie spécifique par ressource : courte pour ce qui bouge souvent
+CACHE_POLICY = {
+    "tickets": 10,
+    "agendaevents": 15,
+    "contacts": 30,
+    "proposals": 30,
+    "thirdparties": 60,
+}
+
+def _resource_of(endpoint: str) -> str:
+    """Retourne la ressource racine d'un endpoint ('tickets/12?x=1' -> 'tickets')"""
+    return endpoint.split('/', 1)[0].split('?', 1)[0]
+
+@functools.lru_cache(maxsize=64)
+def _base_params(limit: int, sort_order: str, sort_field: Optional[str]) -> str:
+    """Partie fixe des paramètres d'URL (limite et tri), mise en cache car elle prend peu de valeurs"""
+    params = []
+    
+    # Ajouter la limite si > 0
+    if limit > 0:
+        params.append(f"limit={limit}")
+    
+    # Ajouter l'ordre de tri
+    if sort_order.upper() in ["ASC", "DESC"]:
+        params.append(f"sortorder={sort_order.upper()}")
+        
+        # Spécifier le champ de tri selon le contexte
+        if sort_field:
+            params.append(f"sortfield={sort_field}")
+        else:
+            # Champ par défaut pour les événements d'agenda
+            params.append(f"sortfield=t.datep")
+    
+    return "&".join(params)
+
+# Échappement des jokers LIKE dans les termes de recherche insérés dans les sqlfilters.
+# Les quotes ne sont pas doublées : Dolibarr échappe lui-même ($db->escape) la valeur
+# entre quotes de chaque critère, "O'Brien" doit donc être transmis tel quel.
+_SQL_ESCAPE = str.maketrans({"\\": "\\\\", "%": r"\%", "_": r"\_"})
+
+# Filtres sqlfilters des événements d'agenda, encodés une fois pour toutes pour l'URL :
+# seules les dates {start}/{end} restent à encoder à chaque appel
+_AGENDA_FILTER_TEMPLATES = {
+    filter_type: _urlquote(template, safe="{}")
+    for filter_type, template in {
+        "future": "t.datep >= '{start}'",
+        "past": "t.datep < '{end}'",
+        "today": "t.datep >= '{start}' AND t.datep <= '{end}'",
+        "this_week": "t.datep >= '{start}' AND t.datep <= '{end}'",
+        "this_month": "t.datep >= '{start}' AND t.datep <= '{end}'",
+    }.items()
+}
+
+def _current_minute() -> datetime.datetime:
+    """Heure courante tronquée à la minute : des requêtes identiques dans la même minute
+    produisent les mêmes sqlfilters et peuvent donc être servies par le cache"""
+    return datetime.datetime.now().replace(second=0, microsecond=0)
+
+def _time_window(filter_type: str, now: datetime.datetime) -> Tuple[Optional[str], Optional[str]]:
+    """Bornes (début, fin) au format Dolibarr pour un filtre temporel d'agenda (None = borne ouverte)"""
+    if filter_type in ("future", "past"):
+        now_str = f"{now:%Y-%m-%d %H:%M:%S}"
+        return (now_str, None) if filter_type == "future" else (None, now_str)
+    
+    day = now.date()
+    if filter_type == "today":
+        start, end = day, day
+    elif filter_type == "this_week":
+        start = day - datetime.timedelta(days=day.weekday())
+        end = start + datetime.timedelta(days=6)
+    elif filter_type == "this_month":
+        start = day.replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+    else:
+        return None, None
+    
+    return f"{start:%Y-%m-%d} 00:00:00", f"{end:%Y-%m-%d} 23:59:59"
+
+# Codes HTTP indiquant une surcharge temporaire de Dolibarr : la requête peut être relancée
+RETRY_STATUS_CODES = (429, 503)
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Délai demandé par l'en-tête Retry-After (secondes ou date HTTP), None si absent ou illisible"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class DynamicSemaphore:
+    """Sémaphore à capacité adaptative (AIMD) selon les réponses de Dolibarr
+    
+    Chaque série de `capacity` réponses obtenues alors que toutes les places étaient occupées
+    ajoute une place (jamais au-delà de `maximum`) ; un 429/503 divise la capacité par deux,
+    au plus une fois par `window` secondes pour qu'une rafale de refus simultanés ne compte
+    que pour un seul signal.
+    """
+    
+    def __init__(self, initial: int, maximum: int, window: float = 1.0):
+        self.maximum = max(1, maximum)
+        self.capacity = min(max(1, initial), self.maximum)
+        self.window = window
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.capacity)
+            self._in_flight += 1
+    
+    async def __aexit__(self, *exc_info):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+    
+    async def record(self, status_code: int):
+        """Ajuste la capacité à partir du code HTTP d'une réponse
+        
+        À appeler avant de libérer la place : une réponse ne compte pour une hausse que si
+        la limite était effectivement atteinte pendant la requête.
+        """
+        async with self._cond:
+            if status_code in RETRY_STATUS_CODES:
+                self._successes = 0
+                now = time.monotonic()
+                if now - self._last_decrease >= self.window:
+                    self._last_decrease = now
+                    self.capacity = max(1, self.capacity // 2)
+                    logger.warning("Dolibarr surchargé (HTTP %s), requêtes simultanées: %d", status_code, self.capacity)
+            elif status_code < 500 and self._in_flight >= self.capacity:
+                self._successes += 1
+                if self._successes >= self.capacity and self.capacity < self.maximum:
+                    self._successes = 0
+                    self.capacity += 1
+                    self._cond.notify()
+
+def retry_async(max_tries: int = 5, base: float = 0.25, cap: float = 8.0, max_elapsed: float = 15.0):
+    """Relance une requête Dolibarr après un 429/503 ou une erreur réseau
+    
+    Backoff exponentiel avec jitter (attente via asyncio.sleep, sans bloquer la boucle),
+    en respectant Retry-After. Aucune nouvelle tentative n'est lancée au-delà de `max_elapsed`
+    secondes depuis le premier essai (un timeout de lecture n'est donc pas relancé).
+    Un POST ou un DELETE n'est relancé sur erreur réseau que si la connexion n'a pas pu
+    être établie, pour ne jamais appliquer deux fois la même écriture.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Any:
+            started = time.monotonic()
+            for attempt in range(1, max_tries + 1):
+                try:
+                    return await func(self, method, endpoint, data)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code not in RETRY_STATUS_CODES:
+                        raise
+                    delay = _retry_after(e.response)
+                    if delay is None:
+                        delay = random.uniform(0, min(cap, base * 2 ** attempt))
+                    if attempt == max_tries or delay > cap or time.monotonic() - started + delay > max_elapsed:
+                        # Les 429/503 ne sont journalisés qu'en avertissement : signaler l'abandon
+                        logger.error("Abandon de %s %s après %d tentative(s): %s", method, endpoint, attempt, e)
+                        raise
+                except httpx.TransportError as e:
+                    never_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    if attempt == max_tries or (method.upper() in ("POST", "DELETE") and not never_sent):
+                        raise
+                    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+                    if time.monotonic() - started + delay > max_elapsed:
+                        raise
+                
+                logger.warning("Nouvelle tentative %d/%d pour %s %s dans %.2fs", attempt + 1, max_tries, method, endpoint, delay)
+                await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+def _normalize_search(search_term: str) -> str:
+    """Supprime les espaces superflus d'un terme de recherche ("  acme   corp " -> "acme corp")
+    
+    Les variantes d'une même recherche produisent ainsi le même endpoint et partagent le cache.
+    """
+    return " ".join(search_term.split()) if search_term else ""
+
+def _wrap_created(result: Any) -> Dict:
+    """Normalise la réponse d'une création : l'API retourne souvent l'ID seul (int) plutôt qu'un objet"""
+    if isinstance(result, dict):
+        return result
+    return {"id": result if isinstance(result, int) else str(result), "status": "created"}
 
 class DolibarrAPI:
     """Client pour l'API Dolibarr - VERSION CORRIGÉE"""
@@ -45,128 +266,243 @@ class DolibarrAPI:
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.headers = {
+        self.headers = MappingProxyType({
             "DOLAPIKEY": api_key,
             "Content-Type": "application/json"
-        }
+        })
+        # Client HTTP partagé : les connexions restent ouvertes entre les appels
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=DOLIBARR_POOL_MAX,
+                max_keepalive_connections=DOLIBARR_POOL_KEEPALIVE,
+            ),
+            http2=True,
+        )
+        # Limite le nombre de requêtes en vol vers Dolibarr : DOLIBARR_MAX_CONCURRENCY est un plafond strict,
+        # la limite effective s'adaptant aux 429/503 renvoyés en dessous de ce plafond
+        self._sem = DynamicSemaphore(DOLIBARR_MAX_CONCURRENCY, DOLIBARR_MAX_CONCURRENCY)
+        # Cache LRU des réponses GET : endpoint -> [horodatage, résultat, JSON formaté ou None]
+        self._cache: "OrderedDict[str, List[Any]]" = OrderedDict()
+        # Compteur d'invalidations par ressource : un GET lancé avant une écriture ne
+        # doit pas remettre en cache la réponse antérieure à cette écriture
+        self._generations: Dict[str, int] = {}
+        # id(résultat) -> endpoint, pour retrouver l'entrée d'un résultat servi par le cache
+        self._cache_keys: Dict[int, str] = {}
+    
+    async def aclose(self):
+        """Ferme le client HTTP partagé"""
+        await self._client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def warmup(self, connections: int = None):
+        """Ouvre à l'avance des connexions vers Dolibarr (erreurs ignorées)
+        
+        En HTTP/2 une seule connexion suffit (multiplexage) ; plusieurs requêtes simultanées
+        ouvrent autant de sockets si le serveur ne parle que HTTP/1.1. Les requêtes passent
+        directement par le client HTTP : ni nouvelle tentative, ni journalisation d'erreur.
+        """
+        if connections is None:
+            connections = DOLIBARR_POOL_WARMUP
+        results = await asyncio.gather(
+            *(self._client.get("status") for _ in range(max(1, connections))),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("Préchauffage de la connexion impossible: %s", result)
     
-    def _build_params(self, limit: int = None, sort_order: str = None, search_filters: str = "", sort_field: str = None) -> str:
+    def _build_params(self, limit: int = None, sort_order: str = None, search_filters: str = "", sort_field: str = None,
+                      pre_encoded: bool = False) -> str:
         """Construit les paramètres d'URL pour les requêtes API - CORRIGÉ"""
         if limit is None:
             limit = DEFAULT_LIMIT
         if sort_order is None:
             sort_order = DEFAULT_SORT_ORDER
         
-        params = []
-        
-        # Ajouter la limite si > 0
-        if limit > 0:
-            params.append(f"limit={limit}")
-        
-        # Ajouter l'ordre de tri
-        if sort_order.upper() in ["ASC", "DESC"]:
-            params.append(f"sortorder={sort_order.upper()}")
-            
-            # Spécifier le champ de tri selon le contexte
-            if sort_field:
-                params.append(f"sortfield={sort_field}")
-            else:
-                # Champ par défaut pour les événements d'agenda
-                params.append(f"sortfield=t.datep")
+        params = _base_params(limit, sort_order, sort_field)
         
         # Ajouter les filtres de recherche - FORMAT CORRIGÉ
         if search_filters:
-            # Encoder correctement les caractères spéciaux pour l'URL
-            import urllib.parse
-            encoded_filters = urllib.parse.quote(search_filters)
-            params.append(f"sqlfilters={encoded_filters}")
+            # Encoder correctement les caractères spéciaux pour l'URL (sauf si déjà fait)
+            encoded_filters = search_filters if pre_encoded else _urlquote(search_filters, safe="")
+            params = f"{params}&sqlfilters={encoded_filters}" if params else f"sqlfilters={encoded_filters}"
         
-        return "?" + "&".join(params) if params else ""
+        return "?" + params if params else ""
 
+    async def _cached_get(self, endpoint: str, ttl: Optional[float] = None, use_cache: bool = True) -> Any:
+        """Effectue un GET en réutilisant la réponse en cache si elle est encore valide
+        
+        Si Dolibarr est injoignable ou répond une erreur 5xx, la dernière réponse connue
+        est renvoyée même expirée, puis resservie sans nouvel appel pendant CACHE_STALE_RETRY
+        secondes. Avec use_cache=False, le cache n'est ni lu ni alimenté.
+        """
+        if not use_cache:
+            return await self._make_request("GET", endpoint)
+        
+        if ttl is None:
+            ttl = CACHE_POLICY.get(_resource_of(endpoint), CACHE_TTL)
+        
+        entry = self._cache.get(endpoint)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            self._cache.move_to_end(endpoint)
+            logger.debug("Cache: %s", endpoint)
+            return entry[1]
+        
+        resource = _resource_of(endpoint)
+        generation = self._generations.get(resource, 0)
+        try:
+            result = await self._make_request("GET", endpoint)
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            is_server_error = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500
+            if entry is None or not is_server_error:
+                raise
+            logger.warning("Dolibarr indisponible, réponse en cache utilisée pour %s", endpoint)
+            # Les appels suivants de la panne ne repassent pas par toutes les tentatives
+            entry[0] = time.monotonic() - ttl + min(CACHE_STALE_RETRY, ttl)
+            return entry[1]
+        
+        if self._generations.get(resource, 0) != generation:
+            # Écriture terminée pendant la lecture : réponse peut-être déjà périmée
+            return result
+        
+        self._drop_cached(endpoint)
+        self._cache[endpoint] = [time.monotonic(), result, None]
+        self._cache_keys[id(result)] = endpoint
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._drop_cached(next(iter(self._cache)))
+        return result
+    
+    def _drop_cached(self, endpoint: str):
+        """Retire une entrée du cache (et son JSON formaté)"""
+        entry = self._cache.pop(endpoint, None)
+        if entry is not None:
+            self._cache_keys.pop(id(entry[1]), None)
+    
+    def _invalidate_cache(self, endpoint: str):
+        """Supprime du cache les entrées de la même ressource (ex: tickets, agendaevents)"""
+        resource = _resource_of(endpoint)
+        self._generations[resource] = self._generations.get(resource, 0) + 1
+        for key in [k for k in self._cache if _resource_of(k) == resource]:
+            self._drop_cached(key)
+    
+    def formatted(self, result: Any, dump) -> str:
+        """Sérialise `result` avec `dump`, en réutilisant le texte mémorisé dans son entrée de cache
+        
+        Seuls les résultats encore présents dans le cache GET sont mémorisés : le texte
+        disparaît avec l'entrée (expiration LRU ou invalidation après une écriture).
+        """
+        entry = self._cache.get(self._cache_keys.get(id(result), ""))
+        if entry is None or entry[1] is not result:
+            return dump(result)
+        if entry[2] is None:
+            entry[2] = dump(result)
+        return entry[2]
+    
+    @retry_async(max_tries=5, base=0.25, cap=8.0)
     async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Any:
-        """Effectue une requête HTTP vers l'API Dolibarr - CORRIGÉE"""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        """Effectue une requête HTTP vers l'API Dolibarr - CORRIGÉE
         
-        logger.debug(f"Requête {method} vers {url}")
-        if data:
-            logger.debug(f"Données: {json.dumps(data, indent=2)}")
+        L'endpoint est relatif à base_url et s'écrit sans '/' initial (ex: "tickets/12").
+        """
+        # Messages de debug formatés uniquement si le niveau DEBUG est actif
+        logger.debug("Requête %s vers %s/%s", method, self.base_url, endpoint)
+        if data and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Données: %s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=self.headers)
-                elif method.upper() == "POST":
-                    response = await client.post(url, headers=self.headers, json=data)
-                elif method.upper() == "PUT":
-                    response = await client.put(url, headers=self.headers, json=data)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url, headers=self.headers)
-                else:
-                    raise ValueError(f"Méthode HTTP non supportée: {method}")
-                
-                # Gestion des erreurs HTTP avec détails
-                if response.status_code >= 400:
-                    try:
-                        error_data = response.json()
-                        error_msg = error_data.get('error', {}).get('message', f'Erreur HTTP {response.status_code}')
-                        logger.error(f"Erreur HTTP {response.status_code}: {error_msg}")
-                        logger.error(f"Détails: {json.dumps(error_data, indent=2)}")
-                    except:
-                        logger.error(f"Erreur HTTP {response.status_code}: {response.text}")
-                    response.raise_for_status()
+        if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Méthode HTTP non supportée: {method}")
+        
+        try:
+            # Corps sérialisé avec orjson (le Content-Type est déjà dans les en-têtes du client)
+            content = orjson.dumps(data) if data is not None else None
+            # Lecture du corps en flux dans un tampon unique, analysé directement par orjson
+            async with self._sem:
+                async with self._client.stream(method.upper(), endpoint, content=content) as response:
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+                await self._sem.record(response.status_code)
+            logger.debug("Réponse %s (%s)", response.status_code, response.http_version)
+            
+            # Gestion des erreurs HTTP : le corps n'est analysé qu'une seule fois
+            if response.status_code >= 400:
+                error_data = None
+                try:
+                    error_data = orjson.loads(body)
+                    error_msg = error_data.get('error', {}).get('message', f'Erreur HTTP {response.status_code}')
+                except (ValueError, AttributeError):
+                    error_msg = body.decode('utf-8', 'replace')
                 
-                return response.json()
+                # 429/503 : réponse transitoire relancée par retry_async, simple avertissement
+                if response.status_code in RETRY_STATUS_CODES:
+                    logger.warning("Erreur HTTP %s: %s", response.status_code, error_msg)
+                else:
+                    logger.error("Erreur HTTP %s: %s", response.status_code, error_msg)
+                if error_data is not None and response.status_code not in RETRY_STATUS_CODES and logger.isEnabledFor(logging.ERROR):
+                    logger.error("Détails: %s", orjson.dumps(error_data, option=orjson.OPT_INDENT_2).decode())
+                raise httpx.HTTPStatusError(
+                    f"Erreur HTTP {response.status_code}: {error_msg}",
+                    request=response.request,
+                    response=response,
+                )
             
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Erreur HTTP {e.response.status_code}: {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Erreur lors de la requête: {str(e)}")
-                raise
+            return orjson.loads(body)
+        
+        except httpx.HTTPStatusError:
+            # Déjà journalisée ci-dessus
+            raise
+        except Exception as e:
+            logger.error("Erreur lors de la requête: %s", e)
+            raise
+        finally:
+            # Toute écriture rend obsolètes les lectures en cache de la ressource
+            if method.upper() != "GET":
+                self._invalidate_cache(endpoint)
     
     # ===== GESTION DES CONTACTS - CORRIGÉE =====
-    async def search_contacts(self, search_term: str = "", limit: int = None, sort_order: str = None) -> List[Dict]:
+    async def search_contacts(self, search_term: str = "", limit: int = None, sort_order: str = None,
+                              use_cache: bool = True) -> List[Dict]:
         """Recherche des contacts dans Dolibarr"""
         search_filters = ""
+        search_term = _normalize_search(search_term)
         if search_term:
-            search_filters = f"(t.lastname:like:'%{search_term}%') OR (t.firstname:like:'%{search_term}%') OR (t.email:like:'%{search_term}%')"
+            safe = search_term.translate(_SQL_ESCAPE)
+            search_filters = f"(t.lastname:like:'%{safe}%') OR (t.firstname:like:'%{safe}%') OR (t.email:like:'%{safe}%')"
         
         params = self._build_params(limit, sort_order, search_filters, "t.lastname")
-        return await self._make_request("GET", f"contacts{params}")
+        return await self._cached_get(f"contacts{params}", use_cache=use_cache)
     
     async def create_contact(self, contact_data: Dict) -> Dict:
         """Crée un nouveau contact - CORRIGÉ pour gérer les réponses int et dict"""
-        result = await self._make_request("POST", "contacts", contact_data)
-        
-        # CORRECTION : Gérer le cas où l'API retourne un int (ID) directement
-        if isinstance(result, int):
-            return {"id": result, "status": "created"}
-        elif isinstance(result, dict):
-            return result
-        else:
-            return {"id": str(result), "status": "created"}
+        return _wrap_created(await self._make_request("POST", "contacts", contact_data))
     
     # ===== GESTION DES ENTREPRISES =====
-    async def get_companies(self, search_term: str = "", limit: int = None, sort_order: str = None) -> List[Dict]:
+    async def get_companies(self, search_term: str = "", limit: int = None, sort_order: str = None,
+                            use_cache: bool = True) -> List[Dict]:
         """Récupère la liste des entreprises"""
         search_filters = ""
+        search_term = _normalize_search(search_term)
         if search_term:
-            search_filters = f"(t.name:like:'%{search_term}%')"
+            search_filters = f"(t.name:like:'%{search_term.translate(_SQL_ESCAPE)}%')"
         
         params = self._build_params(limit, sort_order, search_filters, "t.name")
-        return await self._make_request("GET", f"thirdparties{params}")
+        return await self._cached_get(f"thirdparties{params}", use_cache=use_cache)
+    
+    async def get_company(self, company_id: str) -> Dict:
+        """Récupère une entreprise spécifique"""
+        return await self._cached_get(f"thirdparties/{company_id}")
     
     async def create_company(self, company_data: Dict) -> Dict:
         """Crée une nouvelle entreprise"""
-        result = await self._make_request("POST", "thirdparties", company_data)
-        
-        # CORRECTION : Même logique que pour les contacts
-        if isinstance(result, int):
-            return {"id": result, "status": "created"}
-        elif isinstance(result, dict):
-            return result
-        else:
-            return {"id": str(result), "status": "created"}
+        return _wrap_created(await self._make_request("POST", "thirdparties", company_data))
     
     # ===== GESTION DES PROPOSITIONS =====
     async def get_proposals(self, limit: int = None, sort_order: str = None) -> List[Dict]:
@@ -177,18 +513,11 @@ class DolibarrAPI:
             sort_order = DEFAULT_SORT_ORDER
             
         params = self._build_params(limit, sort_order, "", "t.datec")
-        return await self._make_request("GET", f"proposals{params}")
+        return await self._cached_get(f"proposals{params}")
     
     async def create_proposal(self, proposal_data: Dict) -> Dict:
         """Crée une nouvelle proposition commerciale"""
-        result = await self._make_request("POST", "proposals", proposal_data)
-        
-        if isinstance(result, int):
-            return {"id": result, "status": "created"}
-        elif isinstance(result, dict):
-            return result
-        else:
-            return {"id": str(result), "status": "created"}
+        return _wrap_created(await self._make_request("POST", "proposals", proposal_data))
     
     # ===== AGENDA EVENTS - CORRIGÉ =====
     async def get_agenda_events(self, limit: int = None, sort_order: str = None, filter_type: str = None) -> List[Dict]:
@@ -200,45 +529,27 @@ class DolibarrAPI:
         if sort_order is None:
             sort_order = DEFAULT_SORT_ORDER
         
-        # Construction des filtres temporels - FORMAT CORRIGÉ
+        # Construction des filtres temporels à partir des modèles déjà encodés
         search_filters = ""
-        if filter_type:
-            now = datetime.datetime.now()
-            
-            if filter_type == "future":
-                # CORRECTION : Format de date correct pour Dolibarr
-                search_filters = f"t.datep >= '{now.strftime('%Y-%m-%d %H:%M:%S')}'"
-            elif filter_type == "past":
-                search_filters = f"t.datep < '{now.strftime('%Y-%m-%d %H:%M:%S')}'"
-            elif filter_type == "today":
-                today_start = now.replace(hour=0, minute=0, second=0)
-                today_end = now.replace(hour=23, minute=59, second=59)
-                search_filters = f"t.datep >= '{today_start.strftime('%Y-%m-%d %H:%M:%S')}' AND t.datep <= '{today_end.strftime('%Y-%m-%d %H:%M:%S')}'"
-            elif filter_type == "this_week":
-                week_start = now - datetime.timedelta(days=now.weekday())
-                week_start = week_start.replace(hour=0, minute=0, second=0)
-                week_end = week_start + datetime.timedelta(days=6, hours=23, minutes=59, seconds=59)
-                search_filters = f"t.datep >= '{week_start.strftime('%Y-%m-%d %H:%M:%S')}' AND t.datep <= '{week_end.strftime('%Y-%m-%d %H:%M:%S')}'"
-            elif filter_type == "this_month":
-                month_start = now.replace(day=1, hour=0, minute=0, second=0)
-                if now.month == 12:
-                    month_end = now.replace(year=now.year+1, month=1, day=1, hour=0, minute=0, second=0) - datetime.timedelta(seconds=1)
-                else:
-                    month_end = now.replace(month=now.month+1, day=1, hour=0, minute=0, second=0) - datetime.timedelta(seconds=1)
-                search_filters = f"t.datep >= '{month_start.strftime('%Y-%m-%d %H:%M:%S')}' AND t.datep <= '{month_end.strftime('%Y-%m-%d %H:%M:%S')}'"
+        if filter_type in _AGENDA_FILTER_TEMPLATES:
+            start, end = _time_window(filter_type, _current_minute())
+            search_filters = _AGENDA_FILTER_TEMPLATES[filter_type].format(
+                start=_urlquote(start or "", safe=""),
+                end=_urlquote(end or "", safe=""),
+            )
         
-        params = self._build_params(limit, sort_order, search_filters, "t.datep")
-        return await self._make_request("GET", f"agendaevents{params}")
+        params = self._build_params(limit, sort_order, search_filters, "t.datep", pre_encoded=True)
+        return await self._cached_get(f"agendaevents{params}")
     
     async def get_upcoming_events(self, limit: int = 50, days_ahead: int = 30) -> List[Dict]:
         """Récupère les événements à venir - CORRIGÉ"""
-        now = datetime.datetime.now()
+        now = _current_minute()
         future_date = now + datetime.timedelta(days=days_ahead)
         
         # CORRECTION : Format de filtres correct
-        search_filters = f"t.datep >= '{now.strftime('%Y-%m-%d %H:%M:%S')}' AND t.datep <= '{future_date.strftime('%Y-%m-%d %H:%M:%S')}'"
+        search_filters = f"t.datep >= '{now:%Y-%m-%d %H:%M:%S}' AND t.datep <= '{future_date:%Y-%m-%d %H:%M:%S}'"
         params = self._build_params(limit, "ASC", search_filters, "t.datep")
-        return await self._make_request("GET", f"agendaevents{params}")
+        return await self._cached_get(f"agendaevents{params}")
     
     async def create_agenda_event(self, event_data: Dict) -> Dict:
         """Crée un nouvel événement d'agenda - CORRIGÉ"""
@@ -265,18 +576,11 @@ class DolibarrAPI:
         event_data.setdefault('fulldayevent', 0)
         event_data.setdefault('transparency', 0)
         
-        result = await self._make_request("POST", "agendaevents", event_data)
-        
-        if isinstance(result, int):
-            return {"id": result, "status": "created"}
-        elif isinstance(result, dict):
-            return result
-        else:
-            return {"id": str(result), "status": "created"}
+        return _wrap_created(await self._make_request("POST", "agendaevents", event_data))
     
     async def get_agenda_event(self, event_id: str) -> Dict:
         """Récupère un événement d'agenda spécifique"""
-        return await self._make_request("GET", f"agendaevents/{event_id}")
+        return await self._cached_get(f"agendaevents/{event_id}")
     
     async def update_agenda_event(self, event_id: str, event_data: Dict) -> Dict:
         """Met à jour un événement d'agenda"""
@@ -295,30 +599,23 @@ class DolibarrAPI:
             sort_order = DEFAULT_SORT_ORDER
             
         params = self._build_params(limit, sort_order, "", "t.datec")
-        return await self._make_request("GET", f"tickets{params}")
+        return await self._cached_get(f"tickets{params}")
     
     async def create_ticket(self, ticket_data: Dict) -> Dict:
         """Crée un nouveau ticket"""
-        result = await self._make_request("POST", "tickets", ticket_data)
-        
-        if isinstance(result, int):
-            return {"id": result, "status": "created"}
-        elif isinstance(result, dict):
-            return result
-        else:
-            return {"id": str(result), "status": "created"}
+        return _wrap_created(await self._make_request("POST", "tickets", ticket_data))
     
     async def get_ticket(self, ticket_id: str) -> Dict:
         """Récupère un ticket spécifique"""
-        return await self._make_request("GET", f"tickets/{ticket_id}")
+        return await self._cached_get(f"tickets/{ticket_id}")
     
     async def get_ticket_by_ref(self, ref: str) -> Dict:
         """Récupère un ticket par sa référence"""
-        return await self._make_request("GET", f"tickets/ref/{ref}")
+        return await self._cached_get(f"tickets/ref/{ref}")
     
     async def get_ticket_by_track_id(self, track_id: str) -> Dict:
         """Récupère un ticket par son ID de suivi"""
-        return await self._make_request("GET", f"tickets/track_id/{track_id}")
+        return await self._cached_get(f"tickets/track_id/{track_id}")
     
     async def update_ticket(self, ticket_id: str, ticket_data: Dict) -> Dict:
         """Met à jour un ticket"""
@@ -340,7 +637,7 @@ try:
     from mcp.server.models import InitializationOptions
     MCP_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"Erreur import MCP: {e}")
+    logger.error("Erreur import MCP: %s", e)
     MCP_AVAILABLE = False
 
 if not MCP_AVAILABLE:
@@ -350,6 +647,185 @@ if not MCP_AVAILABLE:
 # Instance de l'API Dolibarr
 dolibarr_api = DolibarrAPI(DOLIBARR_BASE_URL, DOLIBARR_API_KEY)
 
+# Outils de lecture : nom -> appel à partir des arguments (réutilisés par batch_get)
+_READ_TOOLS = {
+    "search_contacts": lambda args: dolibarr_api.search_contacts(
+        args.get("search_term", ""), args.get("limit", DEFAULT_LIMIT), args.get("sort_order", DEFAULT_SORT_ORDER),
+        use_cache=not args.get("no_cache", False)),
+    "get_companies": lambda args: dolibarr_api.get_companies(
+        args.get("search_term", ""), args.get("limit", DEFAULT_LIMIT), args.get("sort_order", DEFAULT_SORT_ORDER),
+        use_cache=not args.get("no_cache", False)),
+    "get_proposals": lambda args: dolibarr_api.get_proposals(
+        args.get("limit", DEFAULT_LIMIT), args.get("sort_order", DEFAULT_SORT_ORDER)),
+    "get_agenda_events": lambda args: dolibarr_api.get_agenda_events(
+        args.get("limit", DEFAULT_AGENDA_LIMIT), args.get("sort_order", DEFAULT_SORT_ORDER), args.get("filter_type")),
+    "get_upcoming_events": lambda args: dolibarr_api.get_upcoming_events(
+        args.get("limit", 50), args.get("days_ahead", 30)),
+    "get_agenda_event": lambda args: dolibarr_api.get_agenda_event(args.get("event_id")),
+    "get_tickets": lambda args: dolibarr_api.get_tickets(
+        args.get("limit", DEFAULT_LIMIT), args.get("sort_order", DEFAULT_SORT_ORDER)),
+    "get_ticket": lambda args: dolibarr_api.get_ticket(args.get("ticket_id")),
+    "get_ticket_by_ref": lambda args: dolibarr_api.get_ticket_by_ref(args.get("ref")),
+    "get_ticket_by_track_id": lambda args: dolibarr_api.get_ticket_by_track_id(args.get("track_id")),
+    "get_tickets_batch": lambda args: _fetch_many(dolibarr_api.get_ticket, args.get("ticket_ids", [])),
+    "get_agenda_events_batch": lambda args: _fetch_many(dolibarr_api.get_agenda_event, args.get("event_ids", [])),
+    "get_companies_batch": lambda args: _fetch_many(dolibarr_api.get_company, args.get("company_ids", [])),
+}
+
+async def _run_batch(calls: List[Dict]) -> List[Dict]:
+    """Exécute en parallèle plusieurs outils de lecture et regroupe leurs résultats"""
+    for call in calls:
+        if call.get("tool") not in _READ_TOOLS:
+            raise ValueError(f"Outil non autorisé dans batch_get: {call.get('tool')}")
+    
+    async def run(call: Dict):
+        # Mêmes règles de validation que pour un appel direct de l'outil
+        arguments = call.get("arguments") or {}
+        VALIDATORS[call["tool"]](arguments)
+        return await _READ_TOOLS[call["tool"]](arguments)
+    
+    results = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+    
+    batch = []
+    for call, result in zip(calls, results):
+        if isinstance(result, Exception):
+            batch.append({"tool": call["tool"], "error": str(result)})
+        else:
+            batch.append({"tool": call["tool"], "result": result})
+    return batch
+
+def _dump(obj: Any) -> str:
+    """Sérialise un résultat en JSON indenté (UTF-8, sans échappement des accents)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+async def _fetch_many(fetch, ids: List[str]) -> List[Dict]:
+    """Récupère plusieurs objets par ID en parallèle ; une erreur n'interrompt pas les autres"""
+    results = await asyncio.gather(*(fetch(object_id) for object_id in ids), return_exceptions=True)
+    return [
+        {"id": object_id, "error": str(result)} if isinstance(result, Exception) else result
+        for object_id, result in zip(ids, results)
+    ]
+
+def _json_handler(fetch):
+    """Construit le gestionnaire d'un outil de lecture : résultat renvoyé en JSON"""
+    async def handler(arguments: dict) -> str:
+        results = await fetch(arguments)
+        # Réponse servie par le cache GET : le JSON formaté est conservé avec l'entrée
+        # (les résultats hors cache, dont ceux lus avec no_cache, sont simplement sérialisés)
+        return dolibarr_api.formatted(results, _dump)
+    return handler
+
+# ===== GESTIONNAIRES DES OUTILS D'ÉCRITURE =====
+# Messages de confirmation (méthodes .format liées une fois pour toutes)
+_TPL_CONTACT_CREATED = "Contact créé avec succès. ID: {id}".format
+_TPL_COMPANY_CREATED = "Entreprise créée avec succès. ID: {id}".format
+_TPL_PROPOSAL_CREATED = "Proposition créée avec succès. ID: {id}".format
+_TPL_EVENT_CREATED = "Événement d'agenda créé avec succès. ID: {id}".format
+_TPL_EVENT_UPDATED = "Événement d'agenda mis à jour avec succès. ID: {id}".format
+_TPL_EVENT_DELETED = "Événement d'agenda supprimé avec succès. ID: {id}".format
+_TPL_TICKET_CREATED = "Ticket créé avec succès. ID: {id}, Référence: {ref}, Track ID: {track}".format
+_TPL_TICKET_UPDATED = "Ticket mis à jour avec succès. ID: {id}".format
+_TPL_TICKET_DELETED = "Ticket supprimé avec succès. ID: {id}".format
+_MSG_TICKET_MESSAGE_ADDED = "Message ajouté au ticket avec succès."
+
+async def _h_create_contact(arguments: dict) -> str:
+    result = await dolibarr_api.create_contact(arguments)
+    return _TPL_CONTACT_CREATED(id=result.get('id', 'N/A'))
+
+async def _h_create_company(arguments: dict) -> str:
+    result = await dolibarr_api.create_company(arguments)
+    return _TPL_COMPANY_CREATED(id=result.get('id', 'N/A'))
+
+async def _h_create_proposal(arguments: dict) -> str:
+    result = await dolibarr_api.create_proposal(arguments)
+    return _TPL_PROPOSAL_CREATED(id=result.get('id', 'N/A'))
+
+async def _h_create_agenda_event(arguments: dict) -> str:
+    result = await dolibarr_api.create_agenda_event(arguments)
+    return _TPL_EVENT_CREATED(id=result.get('id', 'N/A'))
+
+async def _h_update_agenda_event(arguments: dict) -> str:
+    event_id = arguments["event_id"]
+    payload = {k: v for k, v in arguments.items() if k != "event_id"}
+    await dolibarr_api.update_agenda_event(event_id, payload)
+    return _TPL_EVENT_UPDATED(id=event_id)
+
+async def _h_delete_agenda_event(arguments: dict) -> str:
+    event_id = arguments.get("event_id")
+    await dolibarr_api.delete_agenda_event(event_id)
+    return _TPL_EVENT_DELETED(id=event_id)
+
+async def _h_create_ticket(arguments: dict) -> str:
+    result = await dolibarr_api.create_ticket(arguments)
+    return _TPL_TICKET_CREATED(
+        id=result.get('id', 'N/A'), ref=result.get('ref', 'N/A'), track=result.get('track_id', 'N/A'))
+
+async def _h_update_ticket(arguments: dict) -> str:
+    ticket_id = arguments["ticket_id"]
+    payload = {k: v for k, v in arguments.items() if k != "ticket_id"}
+    await dolibarr_api.update_ticket(ticket_id, payload)
+    return _TPL_TICKET_UPDATED(id=ticket_id)
+
+async def _h_add_ticket_message(arguments: dict) -> str:
+    await dolibarr_api.add_ticket_message(arguments)
+    return _MSG_TICKET_MESSAGE_ADDED
+
+async def _h_delete_ticket(arguments: dict) -> str:
+    ticket_id = arguments.get("ticket_id")
+    await dolibarr_api.delete_ticket(ticket_id)
+    return _TPL_TICKET_DELETED(id=ticket_id)
+
+async def _create_many(create, tool: str, items: List[Dict], fields: Tuple[str, ...] = ("id",)) -> List[Dict]:
+    """Crée plusieurs objets en parallèle ; chaque élément indique son index et son ID ou son erreur
+    
+    Chaque élément est validé avec le schéma de l'outil unitaire `tool` : un élément invalide
+    est signalé dans le résultat sans empêcher la création des autres. Il est aussi copié,
+    les méthodes de création complétant leurs données en place.
+    """
+    async def create_one(item: Dict):
+        VALIDATORS[tool](item)
+        return await create(dict(item))
+    
+    results = await asyncio.gather(*(create_one(item) for item in items), return_exceptions=True)
+    return [
+        {"index": index, "error": str(result)} if isinstance(result, Exception)
+        else {"index": index, **{field: result.get(field, 'N/A') for field in fields}}
+        for index, result in enumerate(results)
+    ]
+
+async def _h_create_contacts_bulk(arguments: dict) -> str:
+    return _dump(await _create_many(dolibarr_api.create_contact, "create_contact", arguments.get("items", [])))
+
+async def _h_create_agenda_events_bulk(arguments: dict) -> str:
+    return _dump(await _create_many(dolibarr_api.create_agenda_event, "create_agenda_event", arguments.get("items", [])))
+
+async def _h_create_tickets_bulk(arguments: dict) -> str:
+    items = arguments.get("items", [])
+    return _dump(await _create_many(dolibarr_api.create_ticket, "create_ticket", items, ("id", "ref", "track_id")))
+
+async def _h_batch_get(arguments: dict) -> str:
+    results = await _run_batch(arguments.get("calls", []))
+    return _dump(results)
+
+# Table de dispatch : nom de l'outil -> gestionnaire async(arguments) -> texte
+HANDLERS = {name: _json_handler(fetch) for name, fetch in _READ_TOOLS.items()}
+HANDLERS.update({
+    "create_contact": _h_create_contact,
+    "create_company": _h_create_company,
+    "create_proposal": _h_create_proposal,
+    "create_agenda_event": _h_create_agenda_event,
+    "update_agenda_event": _h_update_agenda_event,
+    "delete_agenda_event": _h_delete_agenda_event,
+    "create_ticket": _h_create_ticket,
+    "update_ticket": _h_update_ticket,
+    "add_ticket_message": _h_add_ticket_message,
+    "delete_ticket": _h_delete_ticket,
+    "create_contacts_bulk": _h_create_contacts_bulk,
+    "create_agenda_events_bulk": _h_create_agenda_events_bulk,
+    "create_tickets_bulk": _h_create_tickets_bulk,
+    "batch_get": _h_batch_get,
+})
+
 # Serveur MCP
 server = Server("dolibarr-mcp")
 
@@ -364,8 +840,81 @@ async def handle_list_prompts() -> List[types.Prompt]:
     """Liste les prompts disponibles"""
     return []
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
+# Propriétés limit/sort_order communes aux outils de recherche
+_LIMIT_SORT_SCHEMA = {
+    "limit": {
+        "type": "integer",
+        "description": f"Nombre maximum de résultats (0=aucune limite, défaut: {DEFAULT_LIMIT})",
+        "default": DEFAULT_LIMIT
+    },
+    "sort_order": {
+        "type": "string",
+        "enum": ["ASC", "DESC"],
+        "description": f"Ordre de tri (ASC=croissant, DESC=décroissant, défaut: {DEFAULT_SORT_ORDER})",
+        "default": DEFAULT_SORT_ORDER
+    }
+}
+
+# Option permettant de contourner le cache (recherches sensibles ou besoin de données fraîches)
+_NO_CACHE_SCHEMA = {
+    "no_cache": {
+        "type": "boolean",
+        "description": "Ignorer le cache et interroger directement Dolibarr (défaut: false)",
+        "default": False
+    }
+}
+
+# Champs d'un contact à créer (create_contact et éléments de create_contacts_bulk)
+_CREATE_CONTACT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "firstname": {"type": "string", "description": "Prénom"},
+        "lastname": {"type": "string", "description": "Nom de famille"},
+        "email": {"type": "string", "description": "Adresse email"},
+        "phone": {"type": "string", "description": "Numéro de téléphone"},
+        "socid": {"type": "integer", "description": "ID de l'entreprise associée"}
+    },
+    "required": ["lastname"]
+}
+
+# Champs d'un événement à créer (create_agenda_event et éléments de create_agenda_events_bulk)
+_CREATE_AGENDA_EVENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "label": {"type": "string", "description": "Libellé de l'événement"},
+        "datep": {"type": "string", "description": "Date de début (YYYY-MM-DD HH:MM:SS)"},
+        "datef": {"type": "string", "description": "Date de fin (YYYY-MM-DD HH:MM:SS)"},
+        "type_id": {"type": "integer", "description": "ID du type d'événement (défaut: 1)"},
+        "fk_soc": {"type": "integer", "description": "ID de l'entreprise associée"},
+        "fk_contact": {"type": "integer", "description": "ID du contact associé"},
+        "note": {"type": "string", "description": "Note/Description"},
+        "location": {"type": "string", "description": "Lieu"},
+        "transparency": {"type": "integer", "description": "Transparence (0=occupé, 1=libre)"},
+        "priority": {"type": "integer", "description": "Priorité (0-5)"},
+        "userownerid": {"type": "integer", "description": "ID du propriétaire (optionnel, valeur par défaut: 5)"}
+    },
+    "required": ["label", "datep"]
+}
+
+# Champs d'un ticket à créer (create_ticket et éléments de create_tickets_bulk)
+_CREATE_TICKET_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "subject": {"type": "string", "description": "Sujet du ticket"},
+        "message": {"type": "string", "description": "Message/Description du problème"},
+        "fk_soc": {"type": "integer", "description": "ID de l'entreprise"},
+        "fk_user_create": {"type": "integer", "description": "ID de l'utilisateur créateur"},
+        "fk_user_assign": {"type": "integer", "description": "ID de l'utilisateur assigné"},
+        "type_code": {"type": "string", "description": "Code du type de ticket"},
+        "category_code": {"type": "string", "description": "Code de la catégorie"},
+        "severity_code": {"type": "string", "description": "Code de sévérité"},
+        "email_from": {"type": "string", "description": "Email de l'expéditeur"},
+        "priority": {"type": "integer", "description": "Priorité (0-5)"}
+    },
+    "required": ["subject", "message"]
+}
+
+def _build_tools() -> list[types.Tool]:
     """Liste des outils disponibles pour Claude - VERSION CORRIGÉE"""
     return [
         # ===== GESTION DES CONTACTS =====
@@ -379,34 +928,15 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "string",
                         "description": "Terme de recherche (nom, prénom, email)"
                     },
-                    "limit": {
-                        "type": "integer",
-                        "description": f"Nombre maximum de résultats (0=aucune limite, défaut: {DEFAULT_LIMIT})",
-                        "default": DEFAULT_LIMIT
-                    },
-                    "sort_order": {
-                        "type": "string",
-                        "enum": ["ASC", "DESC"],
-                        "description": f"Ordre de tri (ASC=croissant, DESC=décroissant, défaut: {DEFAULT_SORT_ORDER})",
-                        "default": DEFAULT_SORT_ORDER
-                    }
+                    **_LIMIT_SORT_SCHEMA,
+                    **_NO_CACHE_SCHEMA
                 }
             }
         ),
         types.Tool(
             name="create_contact",
             description="Crée un nouveau contact dans Dolibarr",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "firstname": {"type": "string", "description": "Prénom"},
-                    "lastname": {"type": "string", "description": "Nom de famille"},
-                    "email": {"type": "string", "description": "Adresse email"},
-                    "phone": {"type": "string", "description": "Numéro de téléphone"},
-                    "socid": {"type": "integer", "description": "ID de l'entreprise associée"}
-                },
-                "required": ["lastname"]
-            }
+            inputSchema=_CREATE_CONTACT_SCHEMA
         ),
         
         # ===== GESTION DES ENTREPRISES =====
@@ -420,17 +950,8 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "string",
                         "description": "Terme de recherche pour filtrer les entreprises"
                     },
-                    "limit": {
-                        "type": "integer",
-                        "description": f"Nombre maximum de résultats (0=aucune limite, défaut: {DEFAULT_LIMIT})",
-                        "default": DEFAULT_LIMIT
-                    },
-                    "sort_order": {
-                        "type": "string",
-                        "enum": ["ASC", "DESC"],
-                        "description": f"Ordre de tri (ASC=croissant, DESC=décroissant, défaut: {DEFAULT_SORT_ORDER})",
-                        "default": DEFAULT_SORT_ORDER
-                    }
+                    **_LIMIT_SORT_SCHEMA,
+                    **_NO_CACHE_SCHEMA
                 }
             }
         ),
@@ -536,23 +1057,7 @@ async def handle_list_tools() -> list[types.Tool]:
         types.Tool(
             name="create_agenda_event",
             description="Crée un nouvel événement d'agenda (userownerid ajouté automatiquement)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "label": {"type": "string", "description": "Libellé de l'événement"},
-                    "datep": {"type": "string", "description": "Date de début (YYYY-MM-DD HH:MM:SS)"},
-                    "datef": {"type": "string", "description": "Date de fin (YYYY-MM-DD HH:MM:SS)"},
-                    "type_id": {"type": "integer", "description": "ID du type d'événement (défaut: 1)"},
-                    "fk_soc": {"type": "integer", "description": "ID de l'entreprise associée"},
-                    "fk_contact": {"type": "integer", "description": "ID du contact associé"},
-                    "note": {"type": "string", "description": "Note/Description"},
-                    "location": {"type": "string", "description": "Lieu"},
-                    "transparency": {"type": "integer", "description": "Transparence (0=occupé, 1=libre)"},
-                    "priority": {"type": "integer", "description": "Priorité (0-5)"},
-                    "userownerid": {"type": "integer", "description": "ID du propriétaire (optionnel, valeur par défaut: 5)"}
-                },
-                "required": ["label", "datep"]
-            }
+            inputSchema=_CREATE_AGENDA_EVENT_SCHEMA
         ),
         types.Tool(
             name="get_agenda_event",
@@ -617,22 +1122,7 @@ async def handle_list_tools() -> list[types.Tool]:
         types.Tool(
             name="create_ticket",
             description="Crée un nouveau ticket de support",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "subject": {"type": "string", "description": "Sujet du ticket"},
-                    "message": {"type": "string", "description": "Message/Description du problème"},
-                    "fk_soc": {"type": "integer", "description": "ID de l'entreprise"},
-                    "fk_user_create": {"type": "integer", "description": "ID de l'utilisateur créateur"},
-                    "fk_user_assign": {"type": "integer", "description": "ID de l'utilisateur assigné"},
-                    "type_code": {"type": "string", "description": "Code du type de ticket"},
-                    "category_code": {"type": "string", "description": "Code de la catégorie"},
-                    "severity_code": {"type": "string", "description": "Code de sévérité"},
-                    "email_from": {"type": "string", "description": "Email de l'expéditeur"},
-                    "priority": {"type": "integer", "description": "Priorité (0-5)"}
-                },
-                "required": ["subject", "message"]
-            }
+            inputSchema=_CREATE_TICKET_SCHEMA
         ),
         types.Tool(
             name="get_ticket",
@@ -707,204 +1197,157 @@ async def handle_list_tools() -> list[types.Tool]:
                 },
                 "required": ["ticket_id"]
             }
+        ),
+        
+        # ===== REQUÊTES GROUPÉES =====
+        types.Tool(
+            name="get_tickets_batch",
+            description="Récupère plusieurs tickets par ID en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ticket_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Liste des IDs de tickets"
+                    }
+                },
+                "required": ["ticket_ids"]
+            }
+        ),
+        types.Tool(
+            name="get_agenda_events_batch",
+            description="Récupère plusieurs événements d'agenda par ID en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "event_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Liste des IDs d'événements"
+                    }
+                },
+                "required": ["event_ids"]
+            }
+        ),
+        types.Tool(
+            name="get_companies_batch",
+            description="Récupère plusieurs entreprises par ID en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "company_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Liste des IDs d'entreprises"
+                    }
+                },
+                "required": ["company_ids"]
+            }
+        ),
+        types.Tool(
+            name="create_contacts_bulk",
+            description="Crée plusieurs contacts en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Liste des contacts à créer (mêmes champs que create_contact, chaque élément validé séparément)"
+                    }
+                },
+                "required": ["items"]
+            }
+        ),
+        types.Tool(
+            name="create_agenda_events_bulk",
+            description="Crée plusieurs événements d'agenda en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Liste des événements à créer (mêmes champs que create_agenda_event, chaque élément validé séparément)"
+                    }
+                },
+                "required": ["items"]
+            }
+        ),
+        types.Tool(
+            name="create_tickets_bulk",
+            description="Crée plusieurs tickets en une seule fois (requêtes parallèles)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Liste des tickets à créer (mêmes champs que create_ticket, chaque élément validé séparément)"
+                    }
+                },
+                "required": ["items"]
+            }
+        ),
+        types.Tool(
+            name="batch_get",
+            description="Exécute plusieurs outils de lecture en parallèle et retourne tous les résultats en une seule réponse",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "calls": {
+                        "type": "array",
+                        "description": "Liste des appels à effectuer",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {
+                                    "type": "string",
+                                    "enum": list(_READ_TOOLS),
+                                    "description": "Nom de l'outil de lecture"
+                                },
+                                "arguments": {
+                                    "type": "object",
+                                    "description": "Arguments de l'outil"
+                                }
+                            },
+                            "required": ["tool"]
+                        }
+                    }
+                },
+                "required": ["calls"]
+            }
         )
     ]
 
+# Liste statique : construite une seule fois au chargement du module
+_TOOLS = _build_tools()
+
+# Validateurs des arguments, compilés une fois à partir des inputSchema (sans injection des valeurs par défaut)
+VALIDATORS = {tool.name: fastjsonschema.compile(tool.inputSchema, use_default=False) for tool in _TOOLS}
+
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """Liste des outils disponibles pour Claude"""
+    return _TOOLS
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
-    """Gestionnaire des appels d'outils - VERSION CORRIGÉE"""
+    """Gestionnaire des appels d'outils - dispatch via la table HANDLERS"""
     try:
-        # ===== GESTION DES CONTACTS =====
-        if name == "search_contacts":
-            search_term = arguments.get("search_term", "")
-            limit = arguments.get("limit", DEFAULT_LIMIT)
-            sort_order = arguments.get("sort_order", DEFAULT_SORT_ORDER)
-            results = await dolibarr_api.search_contacts(search_term, limit, sort_order)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "create_contact":
-            result = await dolibarr_api.create_contact(arguments)
-            # CORRECTION : Gestion correcte de la réponse
-            contact_id = result.get('id', 'N/A') if isinstance(result, dict) else result
-            return [types.TextContent(
-                type="text",
-                text=f"Contact créé avec succès. ID: {contact_id}"
-            )]
-        
-        # ===== GESTION DES ENTREPRISES =====
-        elif name == "get_companies":
-            search_term = arguments.get("search_term", "")
-            limit = arguments.get("limit", DEFAULT_LIMIT)
-            sort_order = arguments.get("sort_order", DEFAULT_SORT_ORDER)
-            results = await dolibarr_api.get_companies(search_term, limit, sort_order)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "create_company":
-            result = await dolibarr_api.create_company(arguments)
-            company_id = result.get('id', 'N/A') if isinstance(result, dict) else result
-            return [types.TextContent(
-                type="text",
-                text=f"Entreprise créée avec succès. ID: {company_id}"
-            )]
-        
-        # ===== GESTION DES PROPOSITIONS =====
-        elif name == "get_proposals":
-            limit = arguments.get("limit", DEFAULT_LIMIT)
-            sort_order = arguments.get("sort_order", DEFAULT_SORT_ORDER)
-            results = await dolibarr_api.get_proposals(limit, sort_order)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "create_proposal":
-            result = await dolibarr_api.create_proposal(arguments)
-            proposal_id = result.get('id', 'N/A') if isinstance(result, dict) else result
-            return [types.TextContent(
-                type="text",
-                text=f"Proposition créée avec succès. ID: {proposal_id}"
-            )]
+        handler = HANDLERS.get(name)
+        if handler is None:
+            raise ValueError(f"Outil inconnu: {name}")
         
-        # ===== AGENDA EVENTS - CORRIGÉS =====
-        elif name == "get_agenda_events":
-            limit = arguments.get("limit", DEFAULT_AGENDA_LIMIT)
-            sort_order = arguments.get("sort_order", DEFAULT_SORT_ORDER)
-            filter_type = arguments.get("filter_type", None)
-            results = await dolibarr_api.get_agenda_events(limit, sort_order, filter_type)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "get_upcoming_events":
-            limit = arguments.get("limit", 50)
-            days_ahead = arguments.get("days_ahead", 30) 
-            results = await dolibarr_api.get_upcoming_events(limit, days_ahead)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "create_agenda_event":
-            result = await dolibarr_api.create_agenda_event(arguments)
-            event_id = result.get('id', 'N/A') if isinstance(result, dict) else result
-            return [types.TextContent(
-                type="text",
-                text=f"Événement d'agenda créé avec succès. ID: {event_id}"
-            )]
-        
-        elif name == "get_agenda_event":
-            event_id = arguments.get("event_id")
-            result = await dolibarr_api.get_agenda_event(event_id)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "update_agenda_event":
-            event_id = arguments.pop("event_id")
-            result = await dolibarr_api.update_agenda_event(event_id, arguments)
-            return [types.TextContent(
-                type="text",
-                text=f"Événement d'agenda mis à jour avec succès. ID: {event_id}"
-            )]
-        
-        elif name == "delete_agenda_event":
-            event_id = arguments.get("event_id")
-            result = await dolibarr_api.delete_agenda_event(event_id)
-            return [types.TextContent(
-                type="text",
-                text=f"Événement d'agenda supprimé avec succès. ID: {event_id}"
-            )]
+        # Arguments invalides rejetés avant tout appel HTTP
+        VALIDATORS[name](arguments)
         
-        # ===== TICKETS =====
-        elif name == "get_tickets":
-            limit = arguments.get("limit", DEFAULT_LIMIT)
-            sort_order = arguments.get("sort_order", DEFAULT_SORT_ORDER)
-            results = await dolibarr_api.get_tickets(limit, sort_order)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(results, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "create_ticket":
-            result = await dolibarr_api.create_ticket(arguments)
-            ticket_id = result.get('id', 'N/A') if isinstance(result, dict) else result
-            ticket_ref = result.get('ref', 'N/A') if isinstance(result, dict) else 'N/A'
-            track_id = result.get('track_id', 'N/A') if isinstance(result, dict) else 'N/A'
-            return [types.TextContent(
-                type="text",
-                text=f"Ticket créé avec succès. ID: {ticket_id}, Référence: {ticket_ref}, Track ID: {track_id}"
-            )]
-        
-        elif name == "get_ticket":
-            ticket_id = arguments.get("ticket_id")
-            result = await dolibarr_api.get_ticket(ticket_id)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "get_ticket_by_ref":
-            ref = arguments.get("ref")
-            result = await dolibarr_api.get_ticket_by_ref(ref)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "get_ticket_by_track_id":
-            track_id = arguments.get("track_id")
-            result = await dolibarr_api.get_ticket_by_track_id(track_id)
-            
-            return [types.TextContent(
-                type="text",
-                text=json.dumps(result, indent=2, ensure_ascii=False)
-            )]
-        
-        elif name == "update_ticket":
-            ticket_id = arguments.pop("ticket_id")
-            result = await dolibarr_api.update_ticket(ticket_id, arguments)
-            return [types.TextContent(
-                type="text",
-                text=f"Ticket mis à jour avec succès. ID: {ticket_id}"
-            )]
-        
-        elif name == "add_ticket_message":
-            result = await dolibarr_api.add_ticket_message(arguments)
-            return [types.TextContent(
-                type="text",
-                text=f"Message ajouté au ticket avec succès."
-            )]
-        
-        elif name == "delete_ticket":
-            ticket_id = arguments.get("ticket_id")
-            result = await dolibarr_api.delete_ticket(ticket_id)
-            return [types.TextContent(
-                type="text",
-                text=f"Ticket supprimé avec succès. ID: {ticket_id}"
-            )]
-        
-        else:
-            raise ValueError(f"Outil inconnu: {name}")
+        text = await handler(arguments)
+        return [types.TextContent(type="text", text=text)]
     
     except Exception as e:
-        logger.error(f"Erreur lors de l'appel de l'outil {name}: {str(e)}")
+        logger.error("Erreur lors de l'appel de l'outil %s: %s", name, e)
         return [types.TextContent(
             type="text",
             text=f"Erreur: {str(e)}"
@@ -914,30 +1357,39 @@ async def main():
     """Point d'entrée principal"""
     logger.info("Démarrage du serveur MCP Dolibarr amélioré...")
     
-    # Test de connexion à l'API
-    try:
-        logger.info("Test de connexion à l'API Dolibarr...")
-        result = await dolibarr_api.search_contacts("", 1)
-        logger.info("✅ Connexion à Dolibarr réussie")
-    except Exception as e:
-        logger.error(f"❌ Erreur de connexion à Dolibarr: {e}")
-        logger.error("Vérifiez votre URL API et votre clé API")
-        sys.exit(1)
-    
-    # Lancement du serveur MCP via stdio
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="dolibarr-mcp",
-                server_version="1.3.1",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
-        )
+    # Le client HTTP partagé vit aussi longtemps que le serveur MCP
+    async with dolibarr_api:
+        # Test de connexion à l'API
+        try:
+            logger.info("Test de connexion à l'API Dolibarr...")
+            result = await dolibarr_api.search_contacts("", 1)
+            logger.info("✅ Connexion à Dolibarr réussie")
+        except Exception as e:
+            logger.error("❌ Erreur de connexion à Dolibarr: %s", e)
+            logger.error("Vérifiez votre URL API et votre clé API")
+            sys.exit(1)
+        
+        # Lancement du serveur MCP via stdio
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            # Connexion rouverte pendant l'initialisation MCP : le premier outil la trouve prête
+            warmup_task = asyncio.create_task(dolibarr_api.warmup())
+            try:
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="dolibarr-mcp",
+                        server_version="1.3.1",
+                        capabilities=server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={},
+                        ),
+                    ),
+                )
+            finally:
+                # Arrêt avant la fermeture du client HTTP
+                warmup_task.cancel()
+                await asyncio.gather(warmup_task, return_exceptions=True)
 
 if __name__ == "__main__":
     try:
@@ -945,5 +1397,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Arrêt du serveur MCP")
     except Exception as e:
-        logger.error(f"Erreur fatale: {e}")
+        logger.error("Erreur fatale: %s", e)
         sys.exit(1)
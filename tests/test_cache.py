@@ -0,0 +1,71 @@
+"""Tests du cache des réponses GET de DolibarrAPI"""
+
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DOLIBARR_API_KEY", "test-api-key")
+os.environ.setdefault("DOLIBARR_BASE_URL", "http://dolibarr.test/api/index.php")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from dolibarr_mcp_server import DolibarrAPI
+
+
+def _api(handler) -> DolibarrAPI:
+    """Client Dolibarr dont les requêtes sont servies par `handler`"""
+    api = DolibarrAPI("http://dolibarr.test/api/index.php", "test-api-key")
+    api._client = httpx.AsyncClient(base_url=api.base_url, transport=httpx.MockTransport(handler))
+    return api
+
+
+def test_get_started_before_write_is_not_cached():
+    async def scenario():
+        ticket = {"id": "1", "subject": "avant"}
+        read_started = asyncio.Event()
+        release_read = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "PUT":
+                ticket["subject"] = "après"
+                return httpx.Response(200, json=ticket)
+            body = dict(ticket)
+            if not read_started.is_set():
+                # Première lecture : répond avec l'état d'avant l'écriture, une fois celle-ci terminée
+                read_started.set()
+                await release_read.wait()
+            return httpx.Response(200, json=body)
+
+        api = _api(handler)
+        async with api:
+            pending_read = asyncio.create_task(api.get_ticket("1"))
+            await read_started.wait()
+            await api.update_ticket("1", {"subject": "après"})
+            release_read.set()
+            assert (await pending_read)["subject"] == "avant"
+            assert (await api.get_ticket("1"))["subject"] == "après"
+
+    asyncio.run(scenario())
+
+
+def test_stale_entry_is_served_without_new_request_during_outage():
+    async def scenario():
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                return httpx.Response(200, json={"id": "1"})
+            return httpx.Response(500, json={"error": {"message": "panne"}})
+
+        api = _api(handler)
+        async with api:
+            await api.get_ticket("1")
+            for entry in api._cache.values():
+                entry[0] -= 100
+            assert await api.get_ticket("1") == {"id": "1"}
+            assert await api.get_ticket("1") == {"id": "1"}
+            assert len(calls) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+"""Tests du sémaphore adaptatif (AIMD) utilisé pour limiter les requêtes vers Dolibarr"""
+
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DOLIBARR_API_KEY", "test-api-key")
+os.environ.setdefault("DOLIBARR_BASE_URL", "http://dolibarr.test/api/index.php")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dolibarr_mcp_server import DynamicSemaphore
+
+
+async def _saturate(sem: DynamicSemaphore, status_code: int, rounds: int):
+    """Occupe toutes les places du sémaphore puis enregistre une réponse par place"""
+    for _ in range(rounds):
+        slots = sem.capacity
+        for _ in range(slots):
+            await sem.__aenter__()
+        for _ in range(slots):
+            await sem.record(status_code)
+        for _ in range(slots):
+            await sem.__aexit__(None, None, None)
+
+
+def test_overload_halves_capacity_once_per_window():
+    async def scenario():
+        sem = DynamicSemaphore(8, 8, window=60.0)
+        await sem.record(429)
+        assert sem.capacity == 4
+        # Les refus suivants de la même rafale ne comptent pas
+        await sem.record(503)
+        assert sem.capacity == 4
+
+    asyncio.run(scenario())
+
+
+def test_capacity_grows_back_when_limit_binds_but_never_above_maximum():
+    async def scenario():
+        sem = DynamicSemaphore(8, 8, window=0.0)
+        await sem.record(429)
+        await sem.record(429)
+        assert sem.capacity == 2
+        await _saturate(sem, 200, rounds=50)
+        assert sem.capacity == 8
+
+    asyncio.run(scenario())
+
+
+def test_capacity_does_not_grow_while_limit_is_not_reached():
+    async def scenario():
+        sem = DynamicSemaphore(8, 8, window=0.0)
+        await sem.record(429)
+        assert sem.capacity == 4
+        # Une seule requête en vol à la fois : la limite n'est jamais atteinte
+        for _ in range(100):
+            async with sem:
+                await sem.record(200)
+        assert sem.capacity == 4
+
+    asyncio.run(scenario())
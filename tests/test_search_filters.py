@@ -0,0 +1,43 @@
+"""Tests des sqlfilters générés pour les recherches de contacts et d'entreprises"""
+
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DOLIBARR_API_KEY", "test-api-key")
+os.environ.setdefault("DOLIBARR_BASE_URL", "http://dolibarr.test/api/index.php")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from dolibarr_mcp_server import DolibarrAPI
+
+
+def _sqlfilters(call) -> str:
+    """Valeur décodée du paramètre sqlfilters envoyé par `call(api)`"""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.params["sqlfilters"])
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        api = DolibarrAPI("http://dolibarr.test/api/index.php", "test-api-key")
+        api._client = httpx.AsyncClient(base_url=api.base_url, transport=httpx.MockTransport(handler))
+        async with api:
+            await call(api)
+
+    asyncio.run(scenario())
+    return sent[0]
+
+
+def test_apostrophe_is_sent_unescaped():
+    # Dolibarr échappe la valeur entre quotes côté serveur : pas de quote doublée
+    assert _sqlfilters(lambda api: api.search_contacts("O'Brien")) == (
+        "(t.lastname:like:'%O'Brien%') OR (t.firstname:like:'%O'Brien%') OR (t.email:like:'%O'Brien%')"
+    )
+    assert _sqlfilters(lambda api: api.get_companies("L'Oréal")) == "(t.name:like:'%L'Oréal%')"
+
+
+def test_like_wildcards_are_escaped():
+    assert _sqlfilters(lambda api: api.get_companies("50%_off")) == r"(t.name:like:'%50\%\_off%')"